@@ -2,53 +2,191 @@
 """Fantasy Cycling Auction Script - Assign riders to teams with prices."""
 
 import csv
+import io
 import sys
 import os
-from openpyxl import load_workbook
+import re
+import select
+import zipfile
+from collections import deque
+from contextlib import contextmanager
+from xml.etree import ElementTree
+from xml.etree.ElementTree import iterparse
 import readchar
+if os.name == 'nt':
+    import msvcrt
+else:
+    import termios
 from rich.console import Console
+from rich.layout import Layout
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 from rich.progress import Progress, BarColumn, TextColumn
+from rich.segment import Segment
 from rich.text import Text
 from rich import box
 
 console = Console()
 
-
-def read_riders_from_excel(filepath):
+# Precomputed progress-bar glyphs, sliced per frame (max bar width: 128)
+PROGRESS_FULL = "█" * 128
+PROGRESS_EMPTY = "░" * 128
+
+# Frame templates: only the variable fields are formatted per key press
+RIDER_TEMPLATE = "[bold]Corridore {i}/{n}:[/bold] [bold cyan]{rider}[/bold cyan]"
+PROGRESS_TEMPLATE = "{bar} {i}/{n}"
+STATUS_ASSIGNED_TEMPLATE = "[green]Assegnazione attuale: {team} - {price}[/green]"
+STATUS_UNASSIGNED = "[yellow]Non ancora assegnato[/yellow]"
+MAIN_PANEL_KW = dict(
+    title="[bold yellow]🚴 ASTA FANTACICLISMO 🚴[/bold yellow]",
+    border_style="yellow",
+    box=box.ROUNDED,
+    padding=(1, 2),
+    height=9,
+)
+
+
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+XLSX_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+XLSX_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _xlsx_active_sheet_path(zf):
+    """Return the archive path of the active worksheet (same sheet openpyxl's wb.active picks)."""
+    workbook = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+    view = workbook.find(f'{XLSX_NS}bookViews/{XLSX_NS}workbookView')
+    active = int(view.get('activeTab', 0)) if view is not None else 0
+    sheets = workbook.findall(f'{XLSX_NS}sheets/{XLSX_NS}sheet')
+    rel_id = sheets[min(active, len(sheets) - 1)].get(f'{XLSX_REL_NS}id')
+    rels = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels.iter(f'{XLSX_PKG_REL_NS}Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            return target[1:] if target.startswith('/') else f"xl/{target}"
+    return 'xl/worksheets/sheet1.xml'
+
+
+def _xlsx_shared_strings(zf):
+    """Read the shared strings table (plain or rich-text <si> entries)."""
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    shared = []
+    with zf.open('xl/sharedStrings.xml') as f:
+        for _, elem in iterparse(f, events=("end",)):
+            if elem.tag == f'{XLSX_NS}si':
+                texts = elem.findall(f'{XLSX_NS}t') or elem.findall(f'{XLSX_NS}r/{XLSX_NS}t')
+                shared.append(''.join(t.text or '' for t in texts))
+                elem.clear()
+    return shared
+
+
+def _xlsx_column_number(letters):
+    """Convert column letters to a 1-based column number ('A' -> 1, 'AA' -> 27)."""
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def _xlsx_cell_value(cell, resolve):
+    """Convert a <c> element to a Python value (str, int, float, bool or None).
+
+    `resolve` maps a shared-string index to its text.
+    """
+    kind = cell.get('t')
+    if kind == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(f'{XLSX_NS}t'))
+    v = cell.find(f'{XLSX_NS}v')
+    if v is None or v.text is None:
+        return None
+    if kind == 's':
+        return resolve(int(v.text))
+    if kind in ('str', 'e'):
+        return v.text
+    if kind == 'b':
+        return v.text == '1'
+    try:
+        return int(v.text)
+    except ValueError:
+        return float(v.text)
+
+
+def _xlsx_iter_rows(filepath, columns):
+    """Stream worksheet rows as tuples of the requested columns' values, skipping the header row.
+
+    Parses the sheet XML directly with iterparse and clears each <row> once
+    processed, so memory stays flat regardless of the number of rows.
+    """
+    with zipfile.ZipFile(filepath) as zf:
+        # Bound list lookup: one C call per shared-string cell, no dict or attribute access
+        resolve = _xlsx_shared_strings(zf).__getitem__
+        with zf.open(_xlsx_active_sheet_path(zf)) as f:
+            row_tag = f'{XLSX_NS}row'
+            cell_tag = f'{XLSX_NS}c'
+            positions = {_xlsx_column_number(col): i for i, col in enumerate(columns)}.get
+            width = len(columns)
+            row_number = 0
+            for _, elem in iterparse(f, events=("end",)):
+                if elem.tag != row_tag:
+                    continue
+                row_number = int(elem.get('r', row_number + 1))
+                if row_number >= 2:
+                    values = [None] * width
+                    column = 0
+                    for cell in elem.iter(cell_tag):
+                        # `r` is optional: without it a cell follows the previous one
+                        ref = cell.get('r')
+                        column = _xlsx_column_number(ref.rstrip('0123456789')) if ref else column + 1
+                        i = positions(column)
+                        if i is not None:
+                            values[i] = _xlsx_cell_value(cell, resolve)
+                    yield tuple(values)
+                elem.clear()
+
+
+def join_rider_name(firstname, surname):
+    """Return "Firstname SURNAME" (e.g., "Tadej POGACAR"); missing parts are skipped.
+
+    Each part is stripped once and joined with a conditional space, so the
+    result never needs a second strip.
+    """
+    firstname = str(firstname).strip() if firstname else ''
+    surname = str(surname).strip() if surname else ''
+    if firstname and surname:
+        return f"{firstname} {surname}"
+    return firstname or surname
+
+
+def read_riders_from_xlsx_stream(filepath):
     """Read rider names from Excel file (surname in col B, first name in col C)."""
-    wb = load_workbook(filepath, read_only=True)
-    ws = wb.active
-    riders = []
-    # Skip header row (min_row=2), read columns B (2) and C (3)
-    for row in ws.iter_rows(min_row=2, min_col=2, max_col=3, values_only=True):
-        surname = str(row[0]).strip() if row[0] else ''
-        firstname = str(row[1]).strip() if row[1] else ''
-        if surname or firstname:
-            # Format: "Firstname SURNAME" (e.g., "Tadej POGACAR")
-            rider = f"{firstname} {surname}".strip()
-            if rider:
-                riders.append(rider)
-    wb.close()
-    return riders
+    names = (join_rider_name(firstname, surname) for surname, firstname in _xlsx_iter_rows(filepath, ('B', 'C')))
+    return [name for name in names if name]
+
+
+def _read_csv_first_column(filepath):
+    """Return the stripped, non-empty values of the first CSV column.
+
+    Plain one-name-per-line files are split directly; the csv module is only
+    used when the file actually needs it (delimiters or quoting).
+    """
+    with open(filepath, 'rb', buffering=1 << 20) as f:
+        data = f.read().decode('utf-8')
+    lines = data.splitlines()
+    if lines and (',' in lines[0] or '"' in data):
+        return [row[0].strip() for row in csv.reader(io.StringIO(data, newline='')) if row and row[0].strip()]
+    return [name for name in map(str.strip, lines) if name]
 
 
 def read_riders_from_csv(filepath):
     """Read rider names from CSV file (first column)."""
-    riders = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        for row in reader:
-            if row and row[0].strip():
-                riders.append(row[0].strip())
-    return riders
+    return _read_csv_first_column(filepath)
 
 
 def read_riders(filepath):
     """Read riders from file (Excel or CSV)."""
     if filepath.endswith('.xlsx') or filepath.endswith('.xls'):
-        return read_riders_from_excel(filepath)
+        return read_riders_from_xlsx_stream(filepath)
     elif filepath.endswith('.csv'):
         return read_riders_from_csv(filepath)
     else:
@@ -59,45 +197,11 @@ def create_progress_bar(current, total, width=40):
     """Create a text-based progress bar."""
     filled = int(width * current / total)
     empty = width - filled
-    bar = "[green]" + "█" * filled + "[/green][dim]" + "░" * empty + "[/dim]"
-    return bar
+    return f"[green]{PROGRESS_FULL[:filled]}[/green][dim]{PROGRESS_EMPTY[:empty]}[/dim]"
 
 
-def display_rider(index, total, rider, current_team, current_price):
-    """Display current rider info with Rich formatting."""
-    console.clear()
-
-    # Build main content
-    progress_bar = create_progress_bar(index + 1, total)
-
-    # Status text
-    if current_team:
-        status_text = f"[green]Assegnazione attuale: {current_team} - {current_price}[/green]"
-    else:
-        status_text = "[yellow]Non ancora assegnato[/yellow]"
-
-    # Build the main panel content
-    content = Text()
-    content.append(f"Corridore {index + 1}/{total}: ", style="bold")
-    content.append(f"{rider}\n\n", style="bold cyan")
-
-    main_text = f"""[bold]Corridore {index + 1}/{total}:[/bold] [bold cyan]{rider}[/bold cyan]
-
-{progress_bar} {index + 1}/{total}
-
-{status_text}"""
-
-    # Create main panel
-    main_panel = Panel(
-        main_text,
-        title="[bold yellow]🚴 ASTA FANTACICLISMO 🚴[/bold yellow]",
-        border_style="yellow",
-        box=box.ROUNDED,
-        padding=(1, 2)
-    )
-    console.print(main_panel)
-
-    # Create commands table
+def build_commands_table():
+    """Create the table listing the key bindings."""
     commands_table = Table(
         show_header=False,
         box=box.SIMPLE,
@@ -111,14 +215,154 @@ def display_rider(index, total, rider, current_team, current_price):
     commands_table.add_row("↓", "Vai al corridore successivo")
     commands_table.add_row("⏎", "Assegna squadra e prezzo")
     commands_table.add_row("q", "Salva ed esci")
+    return commands_table
+
+
+class FrozenRenderable:
+    """Render a static renderable once per size and replay the cached lines."""
+
+    def __init__(self, renderable):
+        self.renderable = renderable
+        self._size = None
+        self._lines = []
+
+    def __rich_console__(self, console, options):
+        size = (options.max_width, options.height)
+        if size != self._size:
+            self._lines = console.render_lines(self.renderable, options, pad=False)
+            self._size = size
+        new_line = Segment.line()
+        for line in self._lines:
+            yield from line
+            yield new_line
+
+
+# The commands never change, so the panel is built once at import and only
+# laid out again if the terminal is resized
+COMMANDS_PANEL = FrozenRenderable(Panel(
+    build_commands_table(),
+    title="[bold]Comandi[/bold]",
+    border_style="blue",
+    box=box.ROUNDED
+))
+
+
+def build_layout():
+    """Build the screen layout once; frames only update its named regions.
+
+    Returns the root layout and the body of the main panel, which holds the
+    `rider`, `progress` and `status` regions.
+    """
+    body = Layout()
+    body.split_column(
+        Layout(name="rider", size=2),
+        Layout(name="progress", size=2),
+        Layout(name="status", size=1),
+    )
+    main_panel = Panel(body, **MAIN_PANEL_KW)
 
-    commands_panel = Panel(
-        commands_table,
-        title="[bold]Comandi[/bold]",
-        border_style="blue",
-        box=box.ROUNDED
+    layout = Layout()
+    layout.split_column(
+        Layout(main_panel, name="main", size=9),
+        Layout(COMMANDS_PANEL, name="commands", size=6),
+        Layout(name="footer"),
     )
-    console.print(commands_panel)
+    return layout, body
+
+
+def display_rider(body, index, total, rider, current_team, current_price):
+    """Update the main panel regions for the current rider."""
+    fields = {'i': index + 1, 'n': total, 'rider': rider, 'bar': create_progress_bar(index + 1, total)}
+
+    # Status text
+    if current_team:
+        status_text = STATUS_ASSIGNED_TEMPLATE.format_map({'team': current_team, 'price': current_price})
+    else:
+        status_text = STATUS_UNASSIGNED
+
+    body["rider"].update(Text.from_markup(RIDER_TEMPLATE.format_map(fields)))
+    body["progress"].update(Text.from_markup(PROGRESS_TEMPLATE.format_map(fields)))
+    body["status"].update(Text.from_markup(status_text))
+
+
+# Index change for each navigation key
+NAV_DELTA = {readchar.key.UP: -1, readchar.key.DOWN: 1}
+
+
+# Keys read ahead while draining arrows, consumed first by read_key
+pending_keys = deque()
+
+# Escape-sequence prefixes that still need more bytes (arrows send ESC [ A, ...)
+KEY_INCOMPLETE = re.compile(rb'\x1b(?:\[[0-9;]*|O)?')
+
+
+@contextmanager
+def cbreak_stdin():
+    """Switch the POSIX terminal to non-canonical, no-echo mode and yield its fd.
+
+    Unlike readchar, this does not flush queued input (TCSANOW, not
+    TCSAFLUSH), and keys are read from the fd directly rather than through
+    sys.stdin's buffer, so select() sees exactly what is still unread.
+    """
+    fd = sys.stdin.fileno()
+    old = termios.tcgetattr(fd)
+    raw = termios.tcgetattr(fd)
+    raw[3] &= ~(termios.ICANON | termios.ECHO)
+    termios.tcsetattr(fd, termios.TCSANOW, raw)
+    try:
+        yield fd
+    finally:
+        termios.tcsetattr(fd, termios.TCSANOW, old)
+
+
+def _read_tty_key(fd):
+    """Read exactly one key from `fd` (blocking): a character or a whole escape sequence."""
+    key = os.read(fd, 1)
+    if key == b'\x1b':
+        # The rest of the sequence may not have arrived yet; a lone ESC times out
+        while KEY_INCOMPLETE.fullmatch(key) and select.select([fd], [], [], 0.05)[0]:
+            key += os.read(fd, 1)
+    elif key and key[0] >= 0xC0:
+        # UTF-8 lead byte: read its continuation bytes
+        key += os.read(fd, 1 if key[0] < 0xE0 else 2 if key[0] < 0xF0 else 3)
+    return key.decode('utf-8', 'replace')
+
+
+def read_key():
+    """Read one key press, returning keys read ahead by drain_nav_keys first."""
+    if pending_keys:
+        return pending_keys.popleft()
+    if os.name == 'nt':
+        return readchar.readkey()
+    with cbreak_stdin() as fd:
+        return _read_tty_key(fd)
+
+
+def drain_nav_keys(initial):
+    """Coalesce `initial` with the arrow keys already queued behind it.
+
+    Returns the net index delta, so a held-down arrow costs a single redraw
+    instead of one per repeat. Reading stops at the first non-navigation
+    key, which is left in pending_keys for read_key, so keys are always
+    handled in the order they were typed.
+    """
+    delta = NAV_DELTA[initial]
+    if os.name == 'nt':
+        while not pending_keys and msvcrt.kbhit():
+            key = readchar.readkey()
+            if key in NAV_DELTA:
+                delta += NAV_DELTA[key]
+            else:
+                pending_keys.append(key)
+        return delta
+    with cbreak_stdin() as fd:
+        while not pending_keys and select.select([fd], [], [], 0)[0]:
+            key = _read_tty_key(fd)
+            if key in NAV_DELTA:
+                delta += NAV_DELTA[key]
+            else:
+                pending_keys.append(key)
+    return delta
 
 
 def get_team_and_price():
@@ -132,23 +376,29 @@ def get_team_and_price():
     console.print("[bold cyan]Inserisci prezzo:[/bold cyan]")
     price_str = input("> ").strip()
 
-    try:
-        price = int(price_str) if price_str else 0
-    except ValueError:
-        price = price_str  # Keep as string if not a number
+    # Integer prices (the common case) take a direct branch, no exception
+    if not price_str:
+        price = 0
+    else:
+        # At most one leading '-'; int() would reject "--5"
+        digits = price_str[1:] if price_str[:1] == '-' else price_str
+        if digits.isdecimal():
+            price = int(price_str)
+        else:
+            price = price_str  # Keep as string if not a number
 
     return team, price
 
 
-def save_results(results, riders, output_file):
+def save_results(riders, teams, prices, output_file):
     """Save auction results to CSV."""
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+    with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(['Corridore', 'Squadra', 'Prezzo'])
-        for i, rider in enumerate(riders):
-            team = results[i].get('team', '')
-            price = results[i].get('price', '')
-            writer.writerow([rider, team if team else '', price if price else ''])
+        writer.writerows(
+            (rider, team or '', price or '')
+            for rider, team, price in zip(riders, teams, prices)
+        )
     console.print(f"\n[bold green]Risultati salvati in:[/bold green] {output_file}")
 
 
@@ -177,55 +427,68 @@ def main():
         console.print("[bold red]Nessun corridore trovato nel file![/bold red]")
         sys.exit(1)
 
-    # Initialize results
-    results = [{'team': None, 'price': None} for _ in riders]
+    # Initialize results (one column per field)
+    teams = [None] * total
+    prices = [None] * total
 
-    # Main loop
+    # Main loop: the layout is built once and only changed regions are updated
+    layout, body = build_layout()
+    layout["footer"].update(Text("\nPremi un tasto...", style="dim"))
     current_index = 0
-
-    while True:
-        rider = riders[current_index]
-        current_team = results[current_index]['team']
-        current_price = results[current_index]['price']
-
-        display_rider(current_index, total, rider, current_team, current_price)
-
-        # Wait for key press
-        console.print("\n[dim]Premi un tasto...[/dim]")
-        key = readchar.readkey()
-
-        if key == readchar.key.UP:
-            # Go to previous rider
-            if current_index > 0:
-                current_index -= 1
-        elif key == readchar.key.DOWN:
-            # Go to next rider
-            if current_index < total - 1:
-                current_index += 1
-        elif key == '\r' or key == '\n':
-            # Enter: assign team and price
-            team, price = get_team_and_price()
-            results[current_index]['team'] = team
-            results[current_index]['price'] = price
-
-            # Auto-advance to next rider
-            if current_index < total - 1:
-                current_index += 1
-            else:
-                # At the end, ask if done
-                console.print("\n[yellow]Raggiunto l'ultimo corridore.[/yellow] Premi 'q' per salvare ed uscire, o un altro tasto per continuare.")
-                key = readchar.readkey()
-                if key == 'q':
-                    break
-        elif key == 'q':
-            # Quit and save
-            break
+    last_frame_key = None
+
+    with Live(layout, console=console, screen=True, auto_refresh=False) as live:
+        while True:
+            rider = riders[current_index]
+            current_team = teams[current_index]
+            current_price = prices[current_index]
+
+            # Redraw only when something visible changed (e.g. not after ↓↑ or an unknown key)
+            frame_key = (current_index, current_team, current_price)
+            if frame_key != last_frame_key:
+                display_rider(body, current_index, total, rider, current_team, current_price)
+                live.refresh()
+                last_frame_key = frame_key
+
+            # Wait for key press
+            key = read_key()
+
+            if key in NAV_DELTA:
+                # Go to previous/next rider, applying all queued arrows at once
+                current_index = min(max(current_index + drain_nav_keys(key), 0), total - 1)
+            elif key == '\r' or key == '\n':
+                # Enter: assign team and price (line input needs the normal screen)
+                live.stop()
+                console.clear()
+                console.print(layout["main"].renderable)
+                team, price = get_team_and_price()
+                live.start()
+                last_frame_key = None  # the screen was left, so always redraw
+                teams[current_index] = team
+                prices[current_index] = price
+
+                # Auto-advance to next rider
+                if current_index < total - 1:
+                    current_index += 1
+                else:
+                    # At the end, ask if done
+                    display_rider(body, current_index, total, rider, team, price)
+                    layout["footer"].update(Text.from_markup("\n[yellow]Raggiunto l'ultimo corridore.[/yellow] Premi 'q' per salvare ed uscire, o un altro tasto per continuare."))
+                    live.refresh()
+                    key = read_key()
+                    layout["footer"].update(Text("\nPremi un tasto...", style="dim"))
+                    last_frame_key = None
+                    if key == 'q':
+                        break
+            elif key == 'q':
+                # Quit and save
+                break
 
     # Save results
-    save_results(results, riders, output_file)
+    save_results(riders, teams, prices, output_file)
 
     # Summary
-    assigned = sum(1 for r in results if r['team'])
+    assigned = sum(1 for team in teams if team)
     console.print(f"\n[bold]Riepilogo:[/bold] [green]{assigned}/{total}[/green] corridori assegnati alle squadre")
 
 
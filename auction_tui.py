@@ -2,13 +2,18 @@
 """Fantasy Cycling Auction TUI - Modern terminal UI with Textual."""
 
 import csv
+import io
+import itertools
 import sys
 import os
-from openpyxl import load_workbook
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+import zipfile
+from xml.etree import ElementTree
+from xml.etree.ElementTree import iterparse
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Horizontal, Vertical, Center
-from textual.reactive import reactive
 from textual.screen import ModalScreen
 from textual.widgets import Button, Footer, Header, Input, Label, ProgressBar, Static
 
@@ -17,54 +22,204 @@ from textual.widgets import Button, Footer, Header, Input, Label, ProgressBar, S
 # Data Functions (reused from auction.py)
 # ============================================================================
 
-def read_riders_from_excel(filepath):
-    """Read rider names and values from Excel file (surname in col B, first name in col C, value in col G)."""
-    wb = load_workbook(filepath, read_only=True)
-    ws = wb.active
-    riders = []
-    for row in ws.iter_rows(min_row=2, min_col=2, max_col=7, values_only=True):
-        surname = str(row[0]).strip() if row[0] else ''
-        firstname = str(row[1]).strip() if row[1] else ''
-        value = row[5] if len(row) > 5 and row[5] is not None else None  # col G (index 5 from col B)
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+XLSX_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+XLSX_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def _xlsx_active_sheet_path(zf):
+    """Return the archive path of the active worksheet (same sheet openpyxl's wb.active picks)."""
+    workbook = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+    view = workbook.find(f'{XLSX_NS}bookViews/{XLSX_NS}workbookView')
+    active = int(view.get('activeTab', 0)) if view is not None else 0
+    sheets = workbook.findall(f'{XLSX_NS}sheets/{XLSX_NS}sheet')
+    rel_id = sheets[min(active, len(sheets) - 1)].get(f'{XLSX_REL_NS}id')
+    rels = ElementTree.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels.iter(f'{XLSX_PKG_REL_NS}Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            return target[1:] if target.startswith('/') else f"xl/{target}"
+    return 'xl/worksheets/sheet1.xml'
+
+
+def _xlsx_shared_strings(zf):
+    """Read the shared strings table (plain or rich-text <si> entries)."""
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    shared = []
+    with zf.open('xl/sharedStrings.xml') as f:
+        for _, elem in iterparse(f, events=("end",)):
+            if elem.tag == f'{XLSX_NS}si':
+                texts = elem.findall(f'{XLSX_NS}t') or elem.findall(f'{XLSX_NS}r/{XLSX_NS}t')
+                shared.append(''.join(t.text or '' for t in texts))
+                elem.clear()
+    return shared
+
+
+def _xlsx_column_number(letters):
+    """Convert column letters to a 1-based column number ('A' -> 1, 'AA' -> 27)."""
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def _xlsx_cell_value(cell, resolve):
+    """Convert a <c> element to a Python value (str, int, float, bool or None).
+
+    `resolve` maps a shared-string index to its text.
+    """
+    kind = cell.get('t')
+    if kind == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(f'{XLSX_NS}t'))
+    v = cell.find(f'{XLSX_NS}v')
+    if v is None or v.text is None:
+        return None
+    if kind == 's':
+        return resolve(int(v.text))
+    if kind in ('str', 'e'):
+        return v.text
+    if kind == 'b':
+        return v.text == '1'
+    try:
+        return int(v.text)
+    except ValueError:
+        return float(v.text)
+
+
+def _xlsx_iter_rows(filepath, columns):
+    """Stream worksheet rows as tuples of the requested columns' values, skipping the header row.
+
+    Parses the sheet XML directly with iterparse and clears each <row> once
+    processed, so memory stays flat regardless of the number of rows.
+    """
+    with zipfile.ZipFile(filepath) as zf:
+        # Bound list lookup: one C call per shared-string cell, no dict or attribute access
+        resolve = _xlsx_shared_strings(zf).__getitem__
+        with zf.open(_xlsx_active_sheet_path(zf)) as f:
+            row_tag = f'{XLSX_NS}row'
+            cell_tag = f'{XLSX_NS}c'
+            positions = {_xlsx_column_number(col): i for i, col in enumerate(columns)}.get
+            width = len(columns)
+            row_number = 0
+            for _, elem in iterparse(f, events=("end",)):
+                if elem.tag != row_tag:
+                    continue
+                row_number = int(elem.get('r', row_number + 1))
+                if row_number >= 2:
+                    values = [None] * width
+                    column = 0
+                    for cell in elem.iter(cell_tag):
+                        # `r` is optional: without it a cell follows the previous one
+                        ref = cell.get('r')
+                        column = _xlsx_column_number(ref.rstrip('0123456789')) if ref else column + 1
+                        i = positions(column)
+                        if i is not None:
+                            values[i] = _xlsx_cell_value(cell, resolve)
+                    yield tuple(values)
+                elem.clear()
+
+
+def xlsx_row_count_hint(filepath):
+    """Return the number of data rows declared by the sheet's <dimension> header (0 if absent).
+
+    Only the sheet preamble is parsed; blank rows inside the range are
+    counted too, so this is an upper bound used until the rows are read.
+    """
+    with zipfile.ZipFile(filepath) as zf, zf.open(_xlsx_active_sheet_path(zf)) as f:
+        for _, elem in iterparse(f, events=("start",)):
+            if elem.tag == f'{XLSX_NS}dimension':
+                last_row = elem.get('ref', '').rpartition(':')[2].lstrip('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+                return max(int(last_row) - 1, 0) if last_row.isdigit() else 0
+            if elem.tag == f'{XLSX_NS}sheetData':
+                break
+    return 0
+
+
+def join_rider_name(firstname, surname):
+    """Return "Firstname SURNAME" (e.g., "Tadej POGACAR"); missing parts are skipped.
+
+    Each part is stripped once and joined with a conditional space, so the
+    result never needs a second strip.
+    """
+    firstname = str(firstname).strip() if firstname else ''
+    surname = str(surname).strip() if surname else ''
+    if firstname and surname:
+        return f"{firstname} {surname}"
+    return firstname or surname
+
+
+def iter_riders_from_excel(filepath):
+    """Yield rider names and values from Excel file (surname in col B, first name in col C, value in col G)."""
+    for surname, firstname, value in _xlsx_iter_rows(filepath, ('B', 'C', 'G')):
         if surname or firstname:
-            rider_name = f"{firstname} {surname}".strip()
+            rider_name = join_rider_name(firstname, surname)
             if rider_name:
-                riders.append({'name': rider_name, 'value': value})
-    wb.close()
-    return riders
+                yield {'name': rider_name, 'value': value}
+
+
+def _read_csv_first_column(filepath):
+    """Return the stripped, non-empty values of the first CSV column.
+
+    Plain one-name-per-line files are split directly; the csv module is only
+    used when the file actually needs it (delimiters or quoting).
+    """
+    with open(filepath, 'rb', buffering=1 << 20) as f:
+        data = f.read().decode('utf-8')
+    lines = data.splitlines()
+    if lines and (',' in lines[0] or '"' in data):
+        return [row[0].strip() for row in csv.reader(io.StringIO(data, newline='')) if row and row[0].strip()]
+    return [name for name in map(str.strip, lines) if name]
 
 
 def read_riders_from_csv(filepath):
     """Read rider names from CSV file (first column). Value is None for CSV files."""
-    riders = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        for row in reader:
-            if row and row[0].strip():
-                riders.append({'name': row[0].strip(), 'value': None})
-    return riders
+    return [{'name': name, 'value': None} for name in _read_csv_first_column(filepath)]
+
+
+# Errors raised while reading a rider file (missing parts, malformed XML, bad archive)
+READ_ERRORS = (OSError, ValueError, KeyError, IndexError, zipfile.BadZipFile, ElementTree.ParseError)
+
 
+def open_riders(filepath):
+    """Open riders from file (Excel or CSV) as a (rider iterator, total, total is exact) triple.
 
-def read_riders(filepath):
-    """Read riders from file (Excel or CSV)."""
+    Excel rows are streamed lazily; their total is an estimate taken from the
+    sheet dimension, which also counts blank rows. CSV files are small and
+    read eagerly, so their total is exact.
+    """
     if filepath.endswith('.xlsx') or filepath.endswith('.xls'):
-        return read_riders_from_excel(filepath)
+        return iter_riders_from_excel(filepath), xlsx_row_count_hint(filepath), False
     elif filepath.endswith('.csv'):
-        return read_riders_from_csv(filepath)
+        riders = read_riders_from_csv(filepath)
+        return iter(riders), len(riders), True
     else:
         raise ValueError(f"Formato file non supportato: {filepath}")
 
 
-def save_results(results, riders, output_file):
-    """Save auction results to CSV."""
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+def open_riders_primed(filepath):
+    """Like open_riders, but also reads the first rider.
+
+    Pulling the first rider forces the expensive part of an Excel read
+    (shared strings, sheet preamble), so calling this from a worker thread
+    leaves only cheap per-row parsing for the UI thread.
+    """
+    riders, total_hint, exact = open_riders(filepath)
+    first_rider = next(riders, None)
+    if first_rider is None:
+        return iter(()), total_hint, exact
+    return itertools.chain([first_rider], riders), total_hint, exact
+
+
+def save_results(names, teams, prices, output_file):
+    """Save auction results to CSV (one row per rider name)."""
+    with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(['Corridore', 'Squadra', 'Prezzo'])
-        for i, rider in enumerate(riders):
-            rider_name = rider['name'] if isinstance(rider, dict) else rider
-            team = results[i].get('team', '')
-            price = results[i].get('price', '')
-            writer.writerow([rider_name, team if team else '', price if price else ''])
+        writer.writerows(
+            (name, team or '', price or '')
+            for name, team, price in zip(names, teams, prices)
+        )
 
 
 # ============================================================================
@@ -299,14 +454,70 @@ class AuctionApp(App):
         Binding("q", "save_quit", "Salva ed Esci"),
     ]
 
-    current_index: reactive[int] = reactive(0)
-
-    def __init__(self, riders: list[str], output_file: str) -> None:
+    def __init__(self, riders: Future, output_file: str) -> None:
         super().__init__()
-        self.riders = riders
+        # Resolves to open_riders_primed's (iterator, total hint) pair
+        self._riders_future = riders
+        self._rider_iter = iter(())
+        self._loaded = False
+        # Plain attribute: each action redraws explicitly, exactly once
+        self.current_index = 0
+        # Riders are stored as parallel columns, normalized once as they are loaded
+        self.names: list[str] = []
+        self.values: list[float | None] = []
+        self._total_hint = 0
+        self._total_exact = False
+        self._exhausted = False
+        self._read_error = None
+        self._last_display_key = None
         self.output_file = output_file
-        self.total = len(riders)
-        self.results = [{'team': None, 'price': None} for _ in riders]
+        # Assignments are journaled to the output file as they happen; see _open_results_file
+        self._csv_file = None
+        self._csv_writer = None
+        self.teams: list[str | None] = []
+        self.prices: list[str | None] = []
+
+    @property
+    def total(self) -> int:
+        """Number of riders: exact once the source is exhausted, otherwise the hint."""
+        if self._exhausted:
+            return len(self.names)
+        return max(self._total_hint, len(self.names))
+
+    @property
+    def total_text(self) -> str:
+        """Total for the labels, marked with '~' while it is only an estimate."""
+        if self._exhausted or self._total_exact:
+            return str(self.total)
+        return f"~{self.total}"
+
+    def _rider_at(self, idx: int) -> str | None:
+        """Return the name of rider `idx`, pulling from the source only as far as needed (None past the end)."""
+        names = self.names
+        while len(names) <= idx and not self._exhausted:
+            try:
+                rider = next(self._rider_iter, None)
+            except READ_ERRORS as exc:
+                # Keep the riders read so far so the session can still be saved
+                self._read_error = f"Errore di lettura dopo {len(names)} corridori: {exc}"
+                self.notify(self._read_error, severity="error", timeout=10)
+                rider = None
+            if rider is None:
+                self._exhausted = True
+                break
+            if isinstance(rider, dict):
+                names.append(rider['name'])
+                self.values.append(rider.get('value'))
+            else:
+                names.append(rider)
+                self.values.append(None)
+            self.teams.append(None)
+            self.prices.append(None)
+        return names[idx] if idx < len(names) else None
+
+    def _load_all(self) -> None:
+        """Pull every remaining rider from the source."""
+        self._rider_at(sys.maxsize)
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -316,7 +527,7 @@ class AuctionApp(App):
                 yield Label("Nome Corridore", id="rider-name")
                 yield Label("", id="rider-value")
             with Container(id="progress-container"):
-                yield ProgressBar(total=self.total, show_eta=False, id="progress-bar")
+                yield ProgressBar(total=None, show_eta=False, id="progress-bar")
                 yield Label("1/1", id="progress-label")
             with Container(id="status-panel"):
                 yield Label("Stato: Non ancora assegnato", id="status-label", classes="status-unassigned")
@@ -328,46 +539,91 @@ class AuctionApp(App):
         yield Footer()
 
     def on_mount(self) -> None:
+        # Look the widgets up once; _update_display runs on every key press
+        self._w_number = self.query_one("#rider-number", Label)
+        self._w_name = self.query_one("#rider-name", Label)
+        self._w_value = self.query_one("#rider-value", Label)
+        self._w_prog = self.query_one("#progress-bar", ProgressBar)
+        self._w_plabel = self.query_one("#progress-label", Label)
+        self._w_status = self.query_one("#status-label", Label)
+        self._w_number.update("")
+        self._w_name.update("Caricamento corridori...")
+        self._w_plabel.update("")
+        self._load_timer = self.set_interval(0.1, self._check_load)
+
+    def _check_load(self) -> None:
+        """Poll the background reader and show the first rider once it is ready."""
+        if not self._riders_future.done():
+            return
+        self._load_timer.stop()
+        try:
+            riders, total_hint, exact = self._riders_future.result()
+        except READ_ERRORS as exc:
+            self.exit(return_code=1, message=f"Errore: {exc}")
+            return
+        self._consume_riders(riders, total_hint, exact)
+
+    def _consume_riders(self, riders: Iterable[dict | str], total_hint: int, exact: bool) -> None:
+        """Start reading from the loaded rider source."""
+        self._rider_iter = iter(riders)
+        self._total_hint = total_hint
+        self._total_exact = exact
+        if self._rider_at(0) is None:
+            self.exit(return_code=1, message="Nessun corridore trovato nel file!")
+            return
+        self._open_results_file()
+        self._loaded = True
         self._update_display()
 
-    def watch_current_index(self, value: int) -> None:
-        self._update_display()
+    def _open_results_file(self) -> None:
+        """Open the output CSV as a crash journal: each assignment is appended and flushed as it is made.
+
+        This only protects against losing a session; it saves no I/O, since on
+        quit the file is still rewritten in roster order by save_results.
+        """
+        self._csv_file = open(self.output_file, 'w', newline='', encoding='utf-8')
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow(['Corridore', 'Squadra', 'Prezzo'])
+        self._csv_file.flush()
+
+    def _write_assignment(self, idx: int) -> None:
+        """Append rider `idx`'s assignment to the output CSV and flush it to disk."""
+        self._csv_writer.writerow([self.names[idx], self.teams[idx], self.prices[idx] or ''])
+        self._csv_file.flush()
 
     def _update_display(self) -> None:
         """Update all display elements based on current index."""
         idx = self.current_index
-        rider = self.riders[idx]
-        rider_name_str = rider['name'] if isinstance(rider, dict) else rider
-        rider_value = rider.get('value') if isinstance(rider, dict) else None
-        result = self.results[idx]
-
-        # Update rider number
-        rider_number = self.query_one("#rider-number", Label)
-        rider_number.update(f"Corridore {idx + 1}/{self.total}")
-
-        # Update rider name
-        rider_name = self.query_one("#rider-name", Label)
-        rider_name.update(rider_name_str)
+        rider_name_str = self._rider_at(idx)
+        # Look one rider ahead so the real total is known on reaching the last one
+        self._rider_at(idx + 1)
+        rider_value = self.values[idx]
+        team = self.teams[idx]
+
+        # Skip the widget updates when nothing visible changed since the last call
+        display_key = (idx, team, self.prices[idx], self.total_text)
+        if display_key == self._last_display_key:
+            return
+        self._last_display_key = display_key
+
+        # Update rider number and name
+        self._w_number.update(f"Corridore {idx + 1}/{self.total_text}")
+        self._w_name.update(rider_name_str)
 
         # Update rider value
-        value_label = self.query_one("#rider-value", Label)
         if rider_value is not None:
-            value_label.update(f"Valore: {rider_value}")
+            self._w_value.update(f"Valore: {rider_value}")
         else:
-            value_label.update("")
+            self._w_value.update("")
 
-        # Update progress bar
-        progress_bar = self.query_one("#progress-bar", ProgressBar)
-        progress_bar.progress = idx + 1
-
-        # Update progress label
-        progress_label = self.query_one("#progress-label", Label)
-        progress_label.update(f"{idx + 1}/{self.total}")
+        # Update progress bar and label
+        self._w_prog.update(total=self.total, progress=idx + 1)
+        self._w_plabel.update(f"{idx + 1}/{self.total_text}")
 
         # Update status
-        status_label = self.query_one("#status-label", Label)
-        if result['team']:
-            status_label.update(f"Assegnato: {result['team']} - {result['price']}")
+        status_label = self._w_status
+        if team:
+            status_label.update(f"Assegnato: {team} - {self.prices[idx]}")
             status_label.remove_class("status-unassigned")
             status_label.add_class("status-assigned")
         else:
@@ -388,36 +644,50 @@ class AuctionApp(App):
 
     def action_previous_rider(self) -> None:
         """Go to previous rider."""
-        if self.current_index > 0:
+        if self._loaded and self.current_index > 0:
             self.current_index -= 1
+            self._update_display()
 
     def action_next_rider(self) -> None:
         """Go to next rider."""
-        if self.current_index < self.total - 1:
+        if not self._loaded:
+            return
+        if self._rider_at(self.current_index + 1) is not None:
             self.current_index += 1
+        # Redraw even at the end: the total may just have dropped to the real count
+        self._update_display()
 
     def action_assign(self) -> None:
         """Open assignment modal."""
-        rider = self.riders[self.current_index]
-        rider_name = rider['name'] if isinstance(rider, dict) else rider
+        if not self._loaded:
+            return
+        rider_name = self._rider_at(self.current_index)
         self.push_screen(AssignmentModal(rider_name), self._handle_assignment)
 
     def _handle_assignment(self, result: tuple[str, str] | None) -> None:
         """Handle modal result."""
         if result:
             team, price = result
-            self.results[self.current_index]['team'] = team
-            self.results[self.current_index]['price'] = price
-            self._update_display()
+            self.teams[self.current_index] = team
+            self.prices[self.current_index] = price
+            self._write_assignment(self.current_index)
             # Auto-advance to next rider
-            if self.current_index < self.total - 1:
+            if self._rider_at(self.current_index + 1) is not None:
                 self.current_index += 1
+            self._update_display()
 
     def action_save_quit(self) -> None:
         """Save results and quit."""
-        save_results(self.results, self.riders, self.output_file)
-        assigned = sum(1 for r in self.results if r['team'])
-        self.exit(message=f"Risultati salvati in: {self.output_file}\nRiepilogo: {assigned}/{self.total} corridori assegnati")
+        if not self._loaded:
+            return
+        self._load_all()
+        self._csv_file.close()
+        save_results(self.names, self.teams, self.prices, self.output_file)
+        assigned = sum(1 for team in self.teams if team)
+        message = f"Risultati salvati in: {self.output_file}\nRiepilogo: {assigned}/{self.total} corridori assegnati"
+        if self._read_error:
+            message += f"\n{self._read_error}"
+        self.exit(message=message)
 
 
 # ============================================================================
@@ -425,18 +695,21 @@ class AuctionApp(App):
 # ============================================================================
 
 def get_unique_output_file(base_name):
-    """Generate unique filename, adding _1, _2, etc. if file exists."""
-    output_file = f"{base_name}_auction_results.csv"
-    if not os.path.exists(output_file):
+    """Generate unique filename, adding _1, _2, etc. if file exists.
+
+    The file is reserved atomically with O_CREAT | O_EXCL, so each candidate
+    costs a single open and two sessions can never pick the same name.
+    """
+    for counter in itertools.count():
+        suffix = f"_{counter}" if counter else ""
+        output_file = f"{base_name}_auction_results{suffix}.csv"
+        try:
+            fd = os.open(output_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            continue
+        os.close(fd)
         return output_file
 
-    counter = 1
-    while True:
-        output_file = f"{base_name}_auction_results_{counter}.csv"
-        if not os.path.exists(output_file):
-            return output_file
-        counter += 1
-
 
 def main():
     if len(sys.argv) < 2:
@@ -453,21 +726,21 @@ def main():
     base_name = os.path.splitext(os.path.basename(input_file))[0]
     output_file = get_unique_output_file(base_name)
 
-    # Read riders
+    # Open riders in the background so the UI comes up immediately
+    # (Excel rows are then read lazily while navigating)
     print(f"Lettura corridori da: {input_file}")
-    riders = read_riders(input_file)
-    total = len(riders)
-    print(f"Trovati {total} corridori")
-
-    if total == 0:
-        print("Nessun corridore trovato nel file!")
-        sys.exit(1)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        riders = executor.submit(open_riders_primed, input_file)
 
-    # Run the TUI app
-    app = AuctionApp(riders, output_file)
-    result = app.run()
+        # Run the TUI app
+        app = AuctionApp(riders, output_file)
+        result = app.run()
     if result:
         print(result)
+    if app.return_code:
+        # Nothing was saved: release the reserved output file
+        os.remove(output_file)
+        sys.exit(app.return_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+"""Key draining in auction.py, exercised through a real pseudo-terminal."""
+
+import os
+import select
+import subprocess
+import sys
+import textwrap
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = textwrap.dedent("""
+    import sys
+    import time
+    import auction
+    print("READY", flush=True)
+    first = auction.read_key()
+    time.sleep(0.3)  # let the rest of the burst queue up behind the first key
+    delta = auction.drain_nav_keys(first)
+    print(repr((delta, auction.read_key(), auction.read_key())), flush=True)
+""")
+
+
+@unittest.skipIf(os.name == 'nt', "needs a POSIX pseudo-terminal")
+class DrainNavKeysTest(unittest.TestCase):
+
+    def run_burst(self, burst):
+        """Type `burst` at once into a child reading keys from a pty; return its result tuple."""
+        master, slave = os.openpty()
+        child = subprocess.Popen(
+            [sys.executable, '-c', CHILD], cwd=ROOT,
+            stdin=slave, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        os.close(slave)
+        try:
+            self.assertEqual(child.stdout.readline().strip(), b"READY")
+            time.sleep(0.2)
+            os.write(master, burst)
+            ready, _, _ = select.select([child.stdout], [], [], 10)
+            self.assertTrue(ready, "child did not report a result")
+            result = child.stdout.readline().decode()
+            child.wait(timeout=10)
+            self.assertEqual(child.returncode, 0, child.stderr.read().decode())
+            return eval(result)
+        finally:
+            if child.poll() is None:
+                child.kill()
+            child.stdout.close()
+            child.stderr.close()
+            os.close(master)
+
+    def test_burst_of_arrows_is_one_move(self):
+        # Enter arrives as '\n' (ICRNL); keys after it stay queued in order
+        self.assertEqual(self.run_burst(b'\x1b[B\x1b[B\x1b[B\x1b[B\rx'), (4, '\n', 'x'))
+
+    def test_drain_stops_at_first_other_key(self):
+        # The arrow after 'q' must not be applied before 'q' is handled
+        self.assertEqual(self.run_burst(b'\x1b[B\x1b[Aq\x1b[B'), (0, 'q', '\x1b[B'))
+
+
+if __name__ == '__main__':
+    unittest.main()